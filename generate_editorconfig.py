@@ -3,10 +3,37 @@
 import os
 import sys
 import argparse
+import array
 import glob
+import itertools
+import logging
 import magic
 import math
-from collections import defaultdict, Counter
+import mmap
+import re
+from collections import Counter
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+
+# Optional: numba fuses the EOL + indentation scan into one compiled pass
+# over the buffer. Everything works (just slower) without it.
+try:
+    import numpy as _np
+    from numba import njit as _njit
+except ImportError:
+    _np = None
+
+# Optional: xxhash fingerprints file contents at several GB/s for the
+# duplicate-content cache; blake2b is the stdlib fallback.
+try:
+    import xxhash
+    _content_hash = xxhash.xxh3_64_intdigest
+except ImportError:
+    import hashlib
+
+    def _content_hash(raw):
+        return hashlib.blake2b(raw, digest_size=8).digest()
+
+log = logging.getLogger(__name__)
 
 # Common binary file extensions to exclude (optional, since libmagic is used)
 BINARY_EXTENSIONS = {
@@ -18,27 +45,275 @@ BINARY_EXTENSIONS = {
     '.mkv', '.mov', '.flv', '.wmv', '.swf'
 }
 
+# Extensions that are always text; skip binary detection for these
+KNOWN_TEXT_EXTENSIONS = frozenset({
+    '.py', '.js', '.ts', '.jsx', '.tsx', '.c', '.h', '.cpp', '.hpp',
+    '.cc', '.cs', '.java', '.go', '.rs', '.rb', '.php', '.pl', '.lua',
+    '.sh', '.bash', '.ps1', '.bat', '.sql', '.r', '.swift', '.kt',
+    '.md', '.rst', '.txt', '.html', '.htm', '.css', '.scss', '.less',
+    '.xml', '.json', '.yaml', '.yml', '.toml', '.ini', '.cfg', '.conf',
+    '.csv', '.tsv'
+})
+
 # Directories to exclude by default
 EXCLUDED_DIRS = {'.git', 'node_modules', '__pycache__', 'venv', 'build', 'dist'}
 
-def is_binary_file(filepath, mime=None):
-    """Check if a file is binary using libmagic."""
+# Minimum number of files before spinning up a process pool is worthwhile
+PARALLEL_THRESHOLD = 64
+
+# Files per work item sent to a pool worker; each worker combines its
+# chunk locally so only one partial aggregate crosses the pipe per chunk
+CHUNK_FILES = 256
+
+# Leading whitespace of every non-blank line, matched directly on raw
+# bytes. A line starts after \r, \n, or \r\n so that CR-only (classic
+# Mac) files are handled like splitlines() did, and \S keeps blank or
+# whitespace-only lines out.
+_INDENT_RE = re.compile(rb'(?:^|[\r\n])([\t ]*)(?=\S)')
+
+# How much of the file header to sniff for binary detection
+HEAD_BYTES = 8192
+
+# Cap on how much of a file is read for analysis; indentation and EOL
+# statistics converge long before this, so the sample is representative
+SAMPLE_BYTES = 512 * 1024
+
+# File size beyond which the sample is pulled through mmap: pages come
+# straight from the page cache and MADV_SEQUENTIAL lets the kernel
+# prefetch ahead of the scan
+MMAP_THRESHOLD = 256 * 1024
+
+# Control bytes that essentially never occur in text files (NUL is handled
+# separately). Bell through CR (7-13) and DEL-free high bytes are allowed.
+_NON_TEXT_BYTES = bytes(range(7)) + bytes(range(14, 32)) + b'\x7f'
+
+# Printable ASCII plus common whitespace; deleting these from a buffer
+# leaves nothing iff the buffer is pure ASCII text
+_ASCII_TEXT_BYTES = bytes(range(9, 14)) + bytes(range(32, 127))
+
+# Per-process cache of content hash -> analyzed properties, so vendored or
+# generated duplicates are only ever analyzed once
+_analysis_cache = {}
+
+if _np is not None:
+    @_njit(cache=True)
+    def _scan_buffer(buf):
+        """Single fused pass over a uint8 buffer.
+
+        Returns (tab_lines, space_lines, crlf, cr, lf, hist) where hist[w]
+        counts space-indented lines of width w (widths >= 32 share the last
+        bucket). \\r, \\n, and \\r\\n all terminate a line and a line only
+        counts if non-whitespace follows its indent, the same rules
+        _INDENT_RE applies on the fallback path — the two scanners must
+        classify every buffer identically.
+        """
+        tab_lines = 0
+        space_lines = 0
+        crlf = 0
+        cr = 0
+        lf = 0
+        hist = _np.zeros(33, dtype=_np.int64)
+        n = buf.shape[0]
+        i = 0
+        at_start = True
+        while i < n:
+            if at_start:
+                at_start = False
+                j = i
+                while j < n and (buf[j] == 9 or buf[j] == 32):
+                    j += 1
+                width = j - i
+                if width > 0 and j < n and (buf[j] < 10 or buf[j] > 13):
+                    if buf[i] == 9:
+                        tab_lines += 1
+                    else:
+                        space_lines += 1
+                        hist[min(width, 32)] += 1
+                i = j
+                continue
+            b = buf[i]
+            if b == 13:
+                if i + 1 < n and buf[i + 1] == 10:
+                    crlf += 1
+                    i += 2
+                else:
+                    cr += 1
+                    i += 1
+                at_start = True
+            elif b == 10:
+                lf += 1
+                i += 1
+                at_start = True
+            else:
+                i += 1
+        return tab_lines, space_lines, crlf, cr, lf, hist
+else:
+    _scan_buffer = None
+
+# Per-process libmagic handle. Compiling the magic DB costs tens of ms, so
+# build it once per process and lazily (handles aren't fork-safe everywhere,
+# so pool workers each get their own on first use).
+_MIME = None
+
+def _get_mime():
+    global _MIME
+    if _MIME is None:
+        _MIME = magic.Magic(mime=True)
+    return _MIME
+
+def _read_sample(f, head):
+    """Extend an already-read header to at most SAMPLE_BYTES of the file.
+
+    Returns (raw, sampled). Files past MMAP_THRESHOLD are sliced out of a
+    sequential-hinted mmap so their pages are served from the page cache
+    without a second buffered copy. A truncated sample is trimmed back to
+    the last newline so a partial trailing line (or split multi-byte
+    sequence) can't skew the counters.
+    """
+    if len(head) < HEAD_BYTES:
+        return head, False
+    raw = None
+    if os.fstat(f.fileno()).st_size > MMAP_THRESHOLD:
+        try:
+            mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        except (OSError, ValueError):
+            pass  # Unmappable (special file, empty map); use plain reads
+        else:
+            with mm:
+                if hasattr(mm, 'madvise'):
+                    mm.madvise(mmap.MADV_SEQUENTIAL)
+                raw = mm[:SAMPLE_BYTES]
+    if raw is None:
+        raw = head + f.read(SAMPLE_BYTES - HEAD_BYTES)
+    if len(raw) < SAMPLE_BYTES:
+        return raw, False
+    cut = raw.rfind(b'\n')
+    if cut != -1:
+        raw = raw[:cut + 1]
+    return raw, True
+
+def _walk_files(root):
+    """Yield paths of regular files under root, skipping EXCLUDED_DIRS.
+
+    os.scandir surfaces each entry's type from the directory read itself,
+    so no extra stat call is needed per file on typical filesystems.
+    Symlinks are not followed.
+    """
+    try:
+        entries = os.scandir(root)
+    except OSError as e:
+        print(f"Error scanning directory {root}: {e}", file=sys.stderr)
+        return
+    with entries:
+        for entry in entries:
+            try:
+                if entry.is_dir(follow_symlinks=False):
+                    if entry.name not in EXCLUDED_DIRS:
+                        yield from _walk_files(entry.path)
+                elif entry.is_file(follow_symlinks=False):
+                    yield entry.path
+            except OSError:
+                continue  # Entry vanished or is unreadable; skip it
+
+def iter_paths(patterns):
+    """Yield files matched by the given patterns, streaming as discovered.
+
+    Directory trees are walked lazily so the full file list is never held
+    in memory. With a single match nothing can overlap, so no dedup state
+    is kept at all; with multiple matches every yielded path is deduped by
+    realpath — whichever order overlapping matches arrive in, a file is
+    only ever yielded once and can't get double voting weight.
+    """
+    all_matched = []
+    for pattern in patterns:
+        matched = glob.glob(pattern, recursive=True)
+        if not matched:
+            print(f"No files matched the pattern: {pattern}", file=sys.stderr)
+        all_matched.extend(matched)
+
+    multiple = len(all_matched) > 1
+    seen = set()
+    for path in all_matched:
+        path = os.path.normpath(path)
+        if multiple:
+            real = os.path.realpath(path)
+            if real in seen:
+                continue
+            seen.add(real)
+        if os.path.isfile(path):
+            yield path
+        elif os.path.isdir(path):
+            if not multiple:
+                yield from _walk_files(path)
+                continue
+            for filepath in _walk_files(path):
+                real = os.path.realpath(filepath)
+                if real in seen:
+                    continue
+                seen.add(real)
+                yield filepath
+
+def _analyze_one(filepath):
+    """Analyze a single file (worker entry point).
+
+    Returns (ext, props) where props is None if the file is binary or
+    yielded no usable indentation/EOL information.
+    """
+    ext = get_file_extension(filepath)
+    if ext in BINARY_EXTENSIONS:
+        return ext, None
     try:
-        if not mime:
-            mime = magic.Magic(mime=True)
-        file_mime = mime.from_file(filepath)
+        with open(filepath, 'rb') as f:
+            head = f.read(HEAD_BYTES)
+            if ext not in KNOWN_TEXT_EXTENSIONS and is_binary_file(head, filepath=filepath):
+                return ext, None
+            raw, _ = _read_sample(f, head)
+    except Exception as e:
+        print(f"Error reading {filepath}: {e}", file=sys.stderr)
+        return ext, None
+    props = analyze_file(filepath, raw=raw)
+    if props['indent_style'] and props['eol']:
+        return ext, props
+    return ext, None
+
+def is_binary_file(head, filepath=None):
+    """Check if a file header is binary, consulting libmagic only when needed.
+
+    A NUL byte in the header means binary (the classic git/diff heuristic)
+    — except under a UTF-16 BOM, where NULs are how ASCII encodes — and a
+    header of purely printable/whitespace bytes means text; only the
+    ambiguous remainder is handed to libmagic. ``filepath`` is used purely
+    for error reporting.
+    """
+    try:
+        if head[:2] in (b'\xff\xfe', b'\xfe\xff'):
+            return False
+        if b'\x00' in head:
+            return True
+        if head.translate(None, _NON_TEXT_BYTES) == head:
+            return False
+        file_mime = _get_mime().from_buffer(head)
         return not file_mime.startswith('text/')
     except Exception as e:
         print(f"Error detecting file type for {filepath}: {e}", file=sys.stderr)
         return True  # Treat as binary if detection fails
 
 def get_file_extension(filepath):
-    """Return the file extension, or '' if none."""
-    _, ext = os.path.splitext(filepath)
-    return ext.lower()
+    """Return the lowercased file extension, or '' if none.
 
-def analyze_file(filepath, mime=None, debug=False):
-    """Analyze a single file and return its properties."""
+    Two C-level rfind scans instead of os.path.splitext's platform-aware
+    parsing; this runs once per discovered file, so it adds up.
+    """
+    name = filepath[filepath.rfind(os.sep) + 1:]
+    i = name.rfind('.')
+    return name[i:].lower() if i > 0 else ''
+
+def analyze_file(filepath, raw=None):
+    """Analyze a single file and return its properties.
+
+    Callers that already hold the file contents can pass them as ``raw`` to
+    avoid a second read from disk.
+    """
     properties = {
         'indent_style': None,
         'indent_size': None,
@@ -46,24 +321,81 @@ def analyze_file(filepath, mime=None, debug=False):
         'charset': None
     }
     try:
-        with open(filepath, 'rb') as f:
-            raw = f.read()
-            # Detect charset
+        if raw is None:
+            with open(filepath, 'rb') as f:
+                raw = f.read()
+        # Identical content (vendored copies, minified bundles) yields
+        # identical properties; hashing is far cheaper than re-analyzing
+        content_key = _content_hash(raw)
+        cached = _analysis_cache.get(content_key)
+        if cached is not None:
+            log.debug("Reusing analysis of identical content for: %s", filepath)
+            return cached
+        # Detect charset. Most source files are pure printable ASCII, which
+        # one vectorized bytes.translate pass can prove far faster than a
+        # UTF-8 decode; otherwise fall back to a BOM sniff, then one strict
+        # UTF-8 attempt to decide between utf-8 and latin-1. Only UTF-16
+        # keeps the decoded text around — every other charset is scanned
+        # on the raw bytes below, so no other branch materializes a str.
+        text = None
+        if not raw.translate(None, _ASCII_TEXT_BYTES):
+            properties['charset'] = 'utf-8'
+        elif raw[:3] == b'\xef\xbb\xbf':
+            properties['charset'] = 'utf-8'
+        elif raw[:2] in (b'\xff\xfe', b'\xfe\xff'):
+            text = raw.decode('utf-16', errors='replace')
+            properties['charset'] = 'utf-16'
+        else:
             try:
-                text = raw.decode('utf-8')
+                raw.decode('utf-8')  # Classification only; result unused
                 properties['charset'] = 'utf-8'
             except UnicodeDecodeError:
-                try:
-                    text = raw.decode('utf-16')
-                    properties['charset'] = 'utf-16'
-                except UnicodeDecodeError:
-                    text = raw.decode('latin-1', errors='replace')
-                    properties['charset'] = 'latin-1'
-        
-        # Detect EOL by counting occurrences
-        crlf_count = text.count('\r\n')
-        cr_count = text.count('\r') - crlf_count  # Subtract CRs that are part of CRLF
-        lf_count = text.count('\n') - crlf_count  # Subtract LFs that are part of CRLF
+                properties['charset'] = 'latin-1'
+
+        # Count line endings and leading indentation. UTF-16 needs the
+        # decoded text since its line endings aren't single bytes; every
+        # other charset is scanned on the raw bytes, by the fused numba
+        # kernel when available or by bytes.count plus the indent regex
+        # otherwise.
+        # Indent widths are bounded in practice, so a fixed 33-slot
+        # histogram (widths >= 32 share the last bucket) replaces an
+        # unbounded per-line container; memory stays O(1) per file.
+        indent_counter = Counter()
+        indent_hist = array.array('i', [0] * 33)
+        if properties['charset'] == 'utf-16':
+            crlf_count = text.count('\r\n')
+            cr_count = text.count('\r') - crlf_count  # Subtract CRs that are part of CRLF
+            lf_count = text.count('\n') - crlf_count  # Subtract LFs that are part of CRLF
+            for line in text.splitlines():
+                stripped_line = line.lstrip('\t ')
+                if not stripped_line:
+                    continue  # Skip empty or whitespace-only lines
+                indent = line[:len(line) - len(stripped_line)]
+                if indent.startswith('\t'):
+                    indent_counter['tab'] += 1
+                elif indent.startswith(' '):
+                    indent_counter['space'] += 1
+                    indent_hist[min(len(indent), 32)] += 1
+        elif _scan_buffer is not None:
+            tab_lines, space_lines, crlf_count, cr_count, lf_count, indent_hist = \
+                _scan_buffer(_np.frombuffer(raw, dtype=_np.uint8))
+            if tab_lines:
+                indent_counter['tab'] = tab_lines
+            if space_lines:
+                indent_counter['space'] = space_lines
+        else:
+            crlf_count = raw.count(b'\r\n')
+            cr_count = raw.count(b'\r') - crlf_count  # Subtract CRs that are part of CRLF
+            lf_count = raw.count(b'\n') - crlf_count  # Subtract LFs that are part of CRLF
+            for m in _INDENT_RE.finditer(raw):
+                indent = m.group(1)
+                if not indent:
+                    continue  # Unindented line
+                if indent[:1] == b'\t':
+                    indent_counter['tab'] += 1
+                else:
+                    indent_counter['space'] += 1
+                    indent_hist[min(len(indent), 32)] += 1
 
         eol_counter = Counter({
             'crlf': crlf_count,
@@ -75,71 +407,112 @@ def analyze_file(filepath, mime=None, debug=False):
         dominant_eol = eol_counter.most_common(1)[0][0] if eol_counter else 'lf'
         properties['eol'] = dominant_eol
 
-        if debug:
-            print(f"Analyzing File: {filepath}")
-            print(f"Line Endings Counts: CRLF={crlf_count}, CR={cr_count}, LF={lf_count}")
-            print(f"Dominant Line Ending: {dominant_eol}")
-
-        # Analyze indentation
-        indent_counter = Counter()
-        indent_sizes = []
-        for line in text.splitlines():
-            stripped_line = line.lstrip('\t ')
-            if not stripped_line:
-                continue  # Skip empty or whitespace-only lines
-            indent = line[:len(line) - len(stripped_line)]
-            if indent.startswith('\t'):
-                indent_counter['tab'] += 1
-            elif indent.startswith(' '):
-                space_count = len(indent)
-                indent_counter['space'] += 1
-                indent_sizes.append(space_count)
+        log.debug("Analyzing File: %s", filepath)
+        log.debug("Line Endings Counts: CRLF=%s, CR=%s, LF=%s",
+                  crlf_count, cr_count, lf_count)
+        log.debug("Dominant Line Ending: %s", dominant_eol)
 
         # Determine dominant indentation style
         if indent_counter:
             dominant_indent_style, count = indent_counter.most_common(1)[0]
             properties['indent_style'] = dominant_indent_style
-            if debug:
-                print(f"Indentation Style Counts: {dict(indent_counter)}")
-                print(f"Dominant Indentation Style: {dominant_indent_style} ({count} occurrences)")
-
-            if dominant_indent_style == 'space' and indent_sizes:
-                # Calculate GCD of all indentation sizes
-                indent_size_gcd = math.gcd(*indent_sizes) if len(indent_sizes) > 1 else indent_sizes[0]
-                properties['indent_size'] = indent_size_gcd
-                if debug:
-                    indent_size_counter = Counter(indent_sizes)
-                    print(f"Indentation Sizes Counts: {dict(indent_size_counter)}")
-                    print(f"Calculated GCD for Indentation Size: {indent_size_gcd}")
+            if log.isEnabledFor(logging.DEBUG):
+                log.debug("Indentation Style Counts: %s", dict(indent_counter))
+                log.debug("Dominant Indentation Style: %s (%s occurrences)",
+                          dominant_indent_style, count)
+
+            if dominant_indent_style == 'space':
+                # Calculate GCD over the occupied histogram slots (at most
+                # 32 values) iteratively; once it hits 1 no further value
+                # can change it, so bail early (common when 2- and 3-space
+                # indents are mixed)
+                indent_size_gcd = 0
+                for width in range(1, len(indent_hist)):
+                    if not indent_hist[width]:
+                        continue
+                    indent_size_gcd = math.gcd(indent_size_gcd, width)
+                    if indent_size_gcd == 1:
+                        break
+                if indent_size_gcd:
+                    properties['indent_size'] = indent_size_gcd
+                    if log.isEnabledFor(logging.DEBUG):
+                        log.debug("Indentation Sizes Counts: %s",
+                                  {w: int(c) for w, c in enumerate(indent_hist) if w and c})
+                        log.debug("Calculated GCD for Indentation Size: %s", indent_size_gcd)
         else:
-            if debug:
-                print("No indentation detected. Defaults will be used.")
+            log.debug("No indentation detected. Defaults will be used.")
+
+        log.debug("-" * 40)
 
-        if debug:
-            print("-" * 40)
+        _analysis_cache[content_key] = properties
 
     except Exception as e:
         print(f"Error analyzing file {filepath}: {e}", file=sys.stderr)
     return properties
 
-def aggregate_properties(file_properties, debug=False):
-    """Aggregate properties across all files grouped by extension."""
-    aggregated = defaultdict(lambda: {
-        'indent_style': Counter(),
-        'indent_size': Counter(),
-        'eol': Counter(),
-        'charset': Counter()
-    })
-    
-    for ext, props_list in file_properties.items():
-        for props in props_list:
-            for prop, value in props.items():
-                if value:
-                    aggregated[ext][prop].update([value])
-                    if debug:
-                        print(f"Aggregating {prop} for *{ext}: {value}")
-    
-    return aggregated
+# Properties aggregated per extension, in column order
+_PROPERTY_KEYS = ('indent_style', 'indent_size', 'eol', 'charset')
+
+def accumulate_properties(ext_id, cols, ext, props):
+    """Fold one file's properties into the per-extension aggregate.
+
+    Extensions are interned to dense row ids and each property is kept as
+    its own column (a list of Counters indexed by row id), so an update
+    costs one dict lookup instead of three nested ones. Folding each file
+    in as it finishes avoids buffering a throwaway props list per
+    extension.
+    """
+    row = _ext_row(ext_id, cols, ext)
+    for prop in _PROPERTY_KEYS:
+        value = props[prop]
+        if value:
+            cols[prop][row][value] += 1
+            log.debug("Aggregating %s for *%s: %s", prop, ext, value)
+
+def _ext_row(ext_id, cols, ext):
+    """Return the aggregate row id for ext, interning it on first sight."""
+    row = ext_id.get(ext)
+    if row is None:
+        row = ext_id[ext] = len(ext_id)
+        for column in cols.values():
+            column.append(Counter())
+    return row
+
+def _analyze_chunk(paths):
+    """Analyze a chunk of paths in a worker, combining results locally.
+
+    Returns {ext: {prop: Counter}} so one partial aggregate crosses the
+    pipe per chunk instead of one props dict per file.
+    """
+    partial = {}
+    for filepath in paths:
+        ext, props = _analyze_one(filepath)
+        if props is None:
+            continue
+        by_prop = partial.get(ext)
+        if by_prop is None:
+            by_prop = partial[ext] = {prop: Counter() for prop in _PROPERTY_KEYS}
+        for prop in _PROPERTY_KEYS:
+            value = props[prop]
+            if value:
+                by_prop[prop][value] += 1
+    return partial
+
+def _merge_partial(ext_id, cols, partial):
+    """Fold a worker's partial aggregate into the parent's columns."""
+    for ext, by_prop in partial.items():
+        row = _ext_row(ext_id, cols, ext)
+        for prop, counter in by_prop.items():
+            cols[prop][row].update(counter)
+
+def _chunks(iterable, size):
+    """Yield successive lists of up to size items from iterable."""
+    it = iter(iterable)
+    while True:
+        chunk = list(itertools.islice(it, size))
+        if not chunk:
+            return
+        yield chunk
 
 def determine_setting(counter, default=None):
     """Determine the most common setting from a Counter."""
@@ -148,47 +521,46 @@ def determine_setting(counter, default=None):
     most_common, _ = counter.most_common(1)[0]
     return most_common
 
-def generate_editorconfig(aggregated, debug=False):
-    """Generate the .editorconfig content based on aggregated properties."""
-    lines = [
-        "root = true",
-        "",
-        "[*]",
-        "charset = utf-8",
-        "end_of_line = lf",
-        "insert_final_newline = true",
-        "trim_trailing_whitespace = true",
-        ""
-    ]
-    
-    for ext, props in sorted(aggregated.items()):
+def generate_editorconfig(ext_id, cols, out):
+    """Write the .editorconfig content for the aggregated properties to out.
+
+    Writing to the (buffered) stream directly avoids materializing the
+    whole document as a list of lines plus a joined copy.
+    """
+    out.write(
+        "root = true\n"
+        "\n"
+        "[*]\n"
+        "charset = utf-8\n"
+        "end_of_line = lf\n"
+        "insert_final_newline = true\n"
+        "trim_trailing_whitespace = true\n"
+    )
+
+    for ext in sorted(ext_id):
         if ext == '':
             continue  # Skip files without extension for now
-        section = f"[*{ext}]"
-        lines.append(section)
-        
+        row = ext_id[ext]
+        out.write(f"\n[*{ext}]\n")
+
         # Indent Style
-        indent_style = determine_setting(props['indent_style'], default='space')
-        lines.append(f"indent_style = {indent_style}")
-        
+        indent_style = determine_setting(cols['indent_style'][row], default='space')
+        out.write(f"indent_style = {indent_style}\n")
+
         # Indent Size
         if indent_style == 'space':
-            indent_size = determine_setting(props['indent_size'], default=4)
-            lines.append(f"indent_size = {indent_size}")
+            indent_size = determine_setting(cols['indent_size'][row], default=4)
+            out.write(f"indent_size = {indent_size}\n")
         elif indent_style == 'tab':
-            lines.append("indent_size = tab")
-        
+            out.write("indent_size = tab\n")
+
         # EOL
-        eol = determine_setting(props['eol'], default='lf')
-        lines.append(f"end_of_line = {eol}")
-        
+        eol = determine_setting(cols['eol'][row], default='lf')
+        out.write(f"end_of_line = {eol}\n")
+
         # Charset
-        charset = determine_setting(props['charset'], default='utf-8')
-        lines.append(f"charset = {charset}")
-        
-        lines.append("")  # Add a blank line after each section
-    
-    return '\n'.join(lines)
+        charset = determine_setting(cols['charset'][row], default='utf-8')
+        out.write(f"charset = {charset}\n")
 
 def parse_arguments():
     parser = argparse.ArgumentParser(
@@ -214,6 +586,10 @@ def parse_arguments():
 
 def main():
     args = parse_arguments()
+    logging.basicConfig(
+        level=logging.DEBUG if args.debug else logging.WARNING,
+        format='%(message)s'
+    )
 
     # Check if .editorconfig exists
     editorconfig_path = os.path.join(os.getcwd(), '.editorconfig')
@@ -221,66 +597,84 @@ def main():
         print("`.editorconfig` already exists. Use --force (-f) to overwrite.", file=sys.stderr)
         sys.exit(1)
     elif os.path.exists(editorconfig_path) and args.force:
-        if args.debug:
-            print(f"Overwriting existing `.editorconfig` at {editorconfig_path}")
+        log.debug("Overwriting existing `.editorconfig` at %s", editorconfig_path)
 
-    # Initialize file_properties as a defaultdict of lists
-    file_properties = defaultdict(list)
-    
-    # Initialize libmagic
+    # Per-extension aggregate, folded into directly as each file finishes
+    ext_id = {}
+    cols = {prop: [] for prop in _PROPERTY_KEYS}
+
+    # Initialize libmagic once up front so a broken install fails fast
     try:
-        mime = magic.Magic(mime=True)
+        _get_mime()
     except Exception as e:
         print(f"Error initializing libmagic: {e}", file=sys.stderr)
         sys.exit(1)
     
-    # Expand glob patterns and collect files
-    files_to_scan = set()
-    for pattern in args.paths:
-        matched = glob.glob(pattern, recursive=True)
-        if not matched:
-            print(f"No files matched the pattern: {pattern}", file=sys.stderr)
-        for path in matched:
-            if os.path.isfile(path):
-                files_to_scan.add(os.path.abspath(path))
-            elif os.path.isdir(path):
-                for root, dirs, files in os.walk(path):
-                    # Modify dirs in-place to skip excluded directories
-                    dirs[:] = [d for d in dirs if d not in EXCLUDED_DIRS]
-                    for file in files:
-                        filepath = os.path.join(root, file)
-                        files_to_scan.add(os.path.abspath(filepath))
-    
-    # Analyze each file
-    for filepath in files_to_scan:
-        # Skip binary files using libmagic
-        if is_binary_file(filepath, mime=mime):
-            if args.debug:
-                print(f"Skipping binary file: {filepath}")
-            continue
-        ext = get_file_extension(filepath)
-        props = analyze_file(filepath, mime=mime, debug=args.debug)
-        # Only consider files with identifiable indentation and EOL
-        if props['indent_style'] and props['eol']:
-            file_properties[ext].append(props)  # Append props dict to the list for the extension
-        else:
-            if args.debug:
-                print(f"Skipping file due to incomplete analysis: {filepath}")
+    # Stream discovered files straight into analysis; the full path list
+    # is never materialized.
+    paths = iter_paths(args.paths)
+
+    # Analysis is embarrassingly parallel at the file level, so fan out
+    # across a process pool for larger trees; stay serial for small trees
+    # (pool startup would dominate) and in debug mode (so the per-file
+    # output stays ordered). Peeking at the first PARALLEL_THRESHOLD paths
+    # decides which, without collecting the rest.
+    parallel = False
+    if not args.debug:
+        first_batch = list(itertools.islice(paths, PARALLEL_THRESHOLD))
+        paths = itertools.chain(first_batch, paths)
+        parallel = len(first_batch) >= PARALLEL_THRESHOLD
+
+    if parallel:
+        # executor.map would drain the whole path stream into pending
+        # futures up front; instead keep a bounded window of chunks in
+        # flight and top it up as results come back, so peak memory is
+        # O(window), not O(total paths).
+        chunk_iter = _chunks(paths, CHUNK_FILES)
+        with ProcessPoolExecutor() as executor:
+            window = 2 * (os.cpu_count() or 1)
+            pending = {executor.submit(_analyze_chunk, chunk)
+                       for chunk in itertools.islice(chunk_iter, window)}
+            while pending:
+                done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                for chunk in itertools.islice(chunk_iter, len(done)):
+                    pending.add(executor.submit(_analyze_chunk, chunk))
+                for future in done:
+                    _merge_partial(ext_id, cols, future.result())
+    else:
+        for filepath in paths:
+            # Cheap extension gates first: known-binary extensions need no
+            # I/O at all, and known-text extensions skip binary detection.
+            ext = get_file_extension(filepath)
+            if ext in BINARY_EXTENSIONS:
+                log.debug("Skipping binary extension: %s", filepath)
+                continue
+            # Read once: sniff the header for binary detection, then hand
+            # the remaining contents to the analyzer.
+            try:
+                with open(filepath, 'rb') as f:
+                    head = f.read(HEAD_BYTES)
+                    binary = (ext not in KNOWN_TEXT_EXTENSIONS
+                              and is_binary_file(head, filepath=filepath))
+                    raw, sampled = (None, False) if binary else _read_sample(f, head)
+            except Exception as e:
+                print(f"Error reading {filepath}: {e}", file=sys.stderr)
+                continue
+            if binary:
+                log.debug("Skipping binary file: %s", filepath)
+                continue
+            if sampled:
+                log.debug("Sampling first %d bytes of large file: %s", len(raw), filepath)
+            props = analyze_file(filepath, raw=raw)
+            # Only consider files with identifiable indentation and EOL
+            if props['indent_style'] and props['eol']:
+                accumulate_properties(ext_id, cols, ext, props)
+            else:
+                log.debug("Skipping file due to incomplete analysis: %s", filepath)
 
-    if args.debug:
-        print("\n--- Aggregating Properties ---\n")
-    
-    # Aggregate properties with equal weighting for each file
-    aggregated = aggregate_properties(file_properties, debug=args.debug)
-    
-    if args.debug:
-        print("\n--- Aggregated Properties ---\n")
-    
-    editorconfig_content = generate_editorconfig(aggregated, debug=args.debug)
-    
     try:
         with open(editorconfig_path, 'w', encoding='utf-8') as f:
-            f.write(editorconfig_content)
+            generate_editorconfig(ext_id, cols, f)
         print("`.editorconfig` has been generated based on the analyzed files.")
     except Exception as e:
         print(f"Error writing .editorconfig: {e}", file=sys.stderr)